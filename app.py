@@ -29,7 +29,8 @@ with st.sidebar:
     st.write("COL Base City:", cfg.get("col_base_city", "London"))
     st.divider()
     st.subheader("Performance")
-    fast_mode = st.toggle("⚡ Fast mode (recommended)", value=True, help="Fewer pages + smaller vectorizer for speed")
+    latency_budget = st.slider("⚡ Latency budget (s)", 0.5, 6.0, float(cfg.get("latency_budget", 2.0)), step=0.5,
+                               help="Sources, pages and vectorizer size are planned to fit this budget")
     max_per_source = st.slider("Max results per source", 20, 200, 60, step=20)
     strict_uk = st.toggle("🇬🇧 Strict UK only (when Market=gb)", value=True)
 
@@ -86,12 +87,12 @@ if go:
             "weights": weights,
             # performance & filtering
             "max_per_source": int(max_per_source),
-            "fast_mode": bool(fast_mode),
+            "latency_budget": float(latency_budget),
             "strict_uk": bool(strict_uk),
         }
         # Use a stable JSON string for the cache key
         prefs_json = json.dumps(prefs, sort_keys=True)
-        jobs = cached_search(cv_text, prefs_json)
+        jobs, report = cached_search(cv_text, prefs_json)
 
     if not jobs:
         st.warning("No results found. Try broader titles/location or lower min salary.")
@@ -117,6 +118,11 @@ if go:
         df = pd.DataFrame(rows)
 
         st.success(f"Found {len(jobs)} roles. Top matches first.")
+        if report.get("skipped"):
+            st.caption(
+                f"Planned for {report['budget_s']:.1f}s (took {report['elapsed_s']:.1f}s). "
+                f"Skipped: {'; '.join(report['skipped'])}"
+            )
 
         # ---------- View toggle (Cards vs Table) ----------
         view_mode = st.radio(
@@ -158,8 +164,8 @@ if go:
                         st.markdown(
                             f"Score: **{sc.get('final', 0):.2f}** · Est £(COL-adj): **{est_txt}** · Source: {j.get('source','')}"
                         )
-                        if j.get("description"):
-                            desc = j["description"]
+                        desc = j.get("description_clean") or j.get("description")
+                        if desc:
                             st.caption((desc[:260] + "…") if len(desc) > 260 else desc)
                     with cols[1]:
                         if j.get("redirect_url"):
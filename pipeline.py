@@ -1,16 +1,21 @@
-from typing import List, Dict, Any
-import json, os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple
+import json, os, time
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from sources import adzuna, remotive, greenhouse, lever
 from scoring import score_jobs
 from comp import estimate_comp
+from textnorm import normalize_jobs
+import planner
 
 CFG = {
     "sources": {"adzuna": True, "remotive": True, "greenhouse": False, "lever": False},
     "greenhouse_boards": [],
     "lever_boards": [],
     "currency": "GBP",
-    "col_base_city": "London"
+    "col_base_city": "London",
+    "latency_budget": 2.0,
+    "max_pages": 1
 }
 
 def load_config():
@@ -40,58 +45,113 @@ def is_gb_location(loc: str) -> bool:
         return True
     return False
 
-def _fetch_all(cfg, query, where, min_salary, max_days_old, country, pages, max_per_source) -> List[Dict[str, Any]]:
+_probe_pool = ThreadPoolExecutor(max_workers=2)
+
+def _fetch_all(cfg, query, where, min_salary, max_days_old, country, plan, max_per_source) -> List[Dict[str, Any]]:
+    results: Dict[Any, List[Dict[str, Any]]] = {}
+
+    def submit(pool, src, arg):
+        if src == "adzuna":
+            return pool.submit(planner.timed, "adzuna", adzuna.fetch, query, where, min_salary, max_days_old, arg, max_per_source, country)
+        if src == "remotive":
+            return pool.submit(planner.timed, "remotive", remotive.fetch, query, max_per_source)
+        fetch = greenhouse.fetch if src == "greenhouse" else lever.fetch
+        return pool.submit(planner.timed, f"{src}:{arg}", fetch, arg, query)
+
+    # Probes re-measure skipped sources; nothing waits on them.
+    for src, arg in plan["probes"]:
+        submit(_probe_pool, src, arg)
+
+    futs = {}
+    ex = ThreadPoolExecutor(max_workers=planner.WORKERS)
+    try:
+        for src, arg in plan["tasks"]:
+            futs[submit(ex, src, arg)] = (src, arg)
+
+        try:
+            for f in as_completed(futs, timeout=plan["deadline_s"]):
+                try:
+                    results[futs[f]] = f.result() or []
+                except Exception:
+                    pass
+        except FuturesTimeout:
+            # Stragglers keep running in the background and still update the stats.
+            for f, (src, arg) in futs.items():
+                if not f.done():
+                    plan["skipped"].append(f"{planner.label(src, arg)} (timed out)")
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+    # Keep each source's own ranking (Adzuna pages in order) and interleave
+    # sources round-robin, so any later truncation drops each source's tail.
+    streams: Dict[str, List[Dict[str, Any]]] = {}
+    for src, arg in plan["tasks"]:  # Adzuna pages are planned in page order
+        if (src, arg) in results:
+            name = src if src == "adzuna" else planner.label(src, arg)
+            streams.setdefault(name, []).extend(results[(src, arg)])
     jobs: List[Dict[str, Any]] = []
-    futs = []
-    with ThreadPoolExecutor(max_workers=8) as ex:
-        if cfg["sources"].get("adzuna"):
-            for p in range(1, pages+1):
-                futs.append(ex.submit(adzuna.fetch, query, where, min_salary, max_days_old, p, max_per_source, country))
-        if cfg["sources"].get("remotive"):
-            futs.append(ex.submit(remotive.fetch, query, max_per_source))
-        if cfg["sources"].get("greenhouse"):
-            for b in cfg.get("greenhouse_boards", []):
-                futs.append(ex.submit(greenhouse.fetch, b, query))
-        if cfg["sources"].get("lever"):
-            for b in cfg.get("lever_boards", []):
-                futs.append(ex.submit(lever.fetch, b, query))
-
-        for f in as_completed(futs):
-            try:
-                jobs += f.result() or []
-            except Exception:
-                pass
+    for row in zip_longest(*streams.values()):
+        jobs += [j for j in row if j is not None]
     return jobs[: max_per_source * 6]  # global sanity cap
 
-def search_and_rank(cv_text: str, prefs: Dict[str, Any]) -> List[Dict[str, Any]]:
+def search_and_rank(cv_text: str, prefs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch, dedupe, filter and rank within `prefs["latency_budget"]` seconds.
+    Returns (ranked jobs, plan report listing what was skipped to stay in budget).
+    """
     cfg = load_config()
+    t0 = time.perf_counter()
     query = prefs.get("query") or prefs.get("target_titles") or ""
     where = prefs.get("location","")
     min_salary = prefs.get("min_salary")
     country = prefs.get("country","gb")
     max_days_old = prefs.get("max_days_old", 30)
     max_per_source = int(prefs.get("max_per_source", 60))
-    fast_mode = bool(prefs.get("fast_mode", True))
     strict_uk = bool(prefs.get("strict_uk", True))
+    budget = float(prefs.get("latency_budget") or cfg.get("latency_budget", 2.0))
 
-    pages = 1 if fast_mode else 2
+    plan = planner.plan(cfg, budget, int(cfg.get("max_pages", 1)), max_per_source)
 
-    jobs = _fetch_all(cfg, query, where, min_salary, max_days_old, country, pages, max_per_source)
+    jobs = _fetch_all(cfg, query, where, min_salary, max_days_old, country, plan, max_per_source)
 
-    # Deduplicate and attach comp
+    # Strict market filter
+    if country == "gb" and strict_uk:
+        jobs = [j for j in jobs if is_gb_location(j.get("location",""))]
+
+    # Clean descriptions once, then deduplicate and attach comp. The content hash
+    # only catches exact reposts (same title, company, location and text, e.g. a
+    # role re-listed under a new URL); it does not match one role across sources,
+    # since Adzuna sends snippets where others send full descriptions.
+    jobs = normalize_jobs(jobs)
     seen = set()
     dedup = []
     for j in jobs:
         key = j.get("redirect_url") or f"{j.get('source')}:{j.get('id')}"
-        if key and key not in seen:
+        # Postings without a description (e.g. Greenhouse) share too little text to match on.
+        chash = j["content_hash"] if j.get("description_clean") else None
+        if key and key not in seen and (chash is None or chash not in seen):
             seen.add(key)
+            if chash: seen.add(chash)
             j["_comp"] = estimate_comp(j, base_city=cfg.get("col_base_city","London"))
             dedup.append(j)
 
-    # Strict market filter
-    if country == "gb" and strict_uk:
-        dedup = [j for j in dedup if is_gb_location(j.get("location",""))]
+    # Size scoring to the time actually left after fetching and normalising.
+    max_docs = planner.score_capacity(plan["max_features"], budget - (time.perf_counter() - t0))
+    if len(dedup) > max_docs:
+        plan["skipped"].append(f"scored {max_docs} of {len(dedup)} roles")
+        dedup = dedup[:max_docs]
 
     # Rank
-    ranked = score_jobs(cv_text, dedup, prefs)
-    return ranked
\ No newline at end of file
+    t1 = time.perf_counter()
+    ranked = score_jobs(cv_text, dedup, dict(prefs, max_features=plan["max_features"]))
+    planner.observe_score(plan["max_features"], time.perf_counter() - t1, len(dedup))
+
+    report = {
+        "budget_s": budget,
+        "elapsed_s": round(time.perf_counter() - t0, 3),
+        "queried": [planner.label(s, a) for s, a in plan["tasks"]],
+        "probed": [planner.label(s, a) for s, a in plan["probes"]],
+        "max_features": plan["max_features"],
+        "skipped": plan["skipped"],
+    }
+    return ranked, report
@@ -0,0 +1,195 @@
+from typing import List, Dict, Any, Tuple
+import threading, time
+
+# Per-task priors (seconds, jobs returned) used until real observations arrive.
+PRIORS = {
+    "adzuna": (0.8, 50.0),
+    "remotive": (1.0, 20.0),
+    "greenhouse": (0.6, 5.0),
+    "lever": (0.6, 5.0),
+}
+# Vectorizer tiers, largest first, with prior scoring cost in seconds per document.
+# Scoring time is modelled as SCORE_FIXED + per_doc * n_docs.
+FEATURE_TIERS = [(40000, 0.0015), (20000, 0.0012), (10000, 0.001), (5000, 0.0009)]
+SCORE_FIXED = 0.05
+MIN_DOCS = 50
+WORKERS = 8
+ALPHA = 0.3  # EWMA smoothing
+PAGE_FULL = 0.9  # fetch a deeper Adzuna page only if pages come back this full
+SCORE_FEATURES = 20000  # tier the fetch plan must leave room to score at
+PROBE_AFTER = 5  # consecutive plans a source is skipped before a background probe
+
+_lock = threading.Lock()
+_stats: Dict[str, List[float]] = {}  # key -> [latency_s, yield]
+_skips: Dict[str, int] = {}  # key -> consecutive plans skipped for latency
+
+def _key(source: str, arg: Any=None) -> str:
+    return source if source in ("adzuna", "remotive") else f"{source}:{arg}"
+
+def observe(key: str, seconds: float, n: float):
+    with _lock:
+        cur = _stats.get(key)
+        if cur is None:
+            _stats[key] = [float(seconds), float(n)]
+        else:
+            cur[0] = (1 - ALPHA) * cur[0] + ALPHA * seconds
+            cur[1] = (1 - ALPHA) * cur[1] + ALPHA * n
+
+def _skip_due(key: str) -> bool:
+    # Skipped work is never observed, so count the skips; every PROBE_AFTER
+    # plans the caller re-measures it off the critical path.
+    with _lock:
+        n = _skips.get(key, 0) + 1
+        _skips[key] = 0 if n >= PROBE_AFTER else n
+    return n >= PROBE_AFTER
+
+def label(source: str, arg: Any) -> str:
+    if arg is None: return source
+    return f"adzuna:page{arg}" if source == "adzuna" else f"{source}:{arg}"
+
+def _score_cost(feats: int, prior: float) -> float:
+    with _lock:
+        s = _stats.get(f"score:{feats}")
+    return s[0] if s is not None else prior
+
+def estimate(key: str) -> Tuple[float, float]:
+    with _lock:
+        s = _stats.get(key)
+    if s is not None:
+        return s[0], s[1]
+    return PRIORS.get(key.split(":")[0], (1.0, 10.0))
+
+def _makespan(lats: List[float]) -> float:
+    # Longest-first onto the least loaded worker, like the fetch pool.
+    loads = [0.0] * WORKERS
+    for l in sorted(lats, reverse=True):
+        i = loads.index(min(loads))
+        loads[i] += l
+    return max(loads)
+
+def plan(cfg: Dict[str, Any], budget_s: float, max_pages: int, max_per_source: int) -> Dict[str, Any]:
+    """
+    Pick which fetch tasks and vectorizer size fit in `budget_s` seconds.
+    Tasks are ranked by expected jobs per second and added greedily while the
+    simulated fetch wall time fits the budget and the expected roles can still
+    be scored at the 20k tier in the time left. Sources skipped for latency are
+    returned as `probes` every PROBE_AFTER plans, to run outside the deadline.
+    """
+    cands = []  # (source, arg, key)
+    if cfg["sources"].get("adzuna"):
+        for p in range(1, max_pages+1):
+            cands.append(("adzuna", p, _key("adzuna")))
+    if cfg["sources"].get("remotive"):
+        cands.append(("remotive", None, _key("remotive")))
+    for src in ("greenhouse", "lever"):
+        if cfg["sources"].get(src):
+            for b in cfg.get(f"{src}_boards", []):
+                cands.append((src, b, _key(src, b)))
+
+    def rate(c):
+        lat, n = estimate(c[2])
+        n = min(n, max_per_source)
+        if c[0] == "adzuna":
+            n = n / c[1]  # deeper pages are worth less than the first
+        return n / max(lat, 0.05)
+
+    # First Adzuna page and single-call sources go first at equal rate.
+    cands.sort(key=lambda c: (-rate(c), c[1] if c[0] == "adzuna" else 0))
+
+    min_score = SCORE_FIXED + MIN_DOCS * FEATURE_TIERS[-1][1]
+    fetch_budget = max(budget_s - min_score, 0.0)
+
+    tasks, skipped, lats, exp_docs = [], [], [], 0.0
+    slow: Dict[str, Tuple[str, Any]] = {}  # key -> first task skipped for latency
+    slow_msg: Dict[str, str] = {}
+    for src, arg, key in cands:
+        lat, n = estimate(key)
+        n = min(n, max_per_source)
+        name = label(src, arg)
+        if src == "adzuna" and arg > 1:
+            if ("adzuna", arg-1) not in tasks:
+                skipped.append(f"{name} (previous page skipped)")
+                continue
+            # Another call only pays off if the last page came back full.
+            if n < PAGE_FULL * max_per_source:
+                skipped.append(f"{name} (previous page not full)")
+                continue
+        span = _makespan(lats + [lat])
+        if span > fetch_budget:
+            skipped.append(f"{name} (~{lat:.1f}s over budget)")
+            if key not in slow:
+                slow[key], slow_msg[key] = (src, arg), skipped[-1]
+            continue
+        if tasks and exp_docs + n > score_capacity(SCORE_FEATURES, budget_s - span):
+            skipped.append(f"{name} (too many roles to score in time)")
+            continue
+        tasks.append((src, arg))
+        lats.append(lat)
+        exp_docs += n
+
+    # Nothing fits: run the fastest source anyway, with some slack on its deadline.
+    forced = not tasks and bool(slow)
+    if forced:
+        key, (src, arg) = min(slow.items(), key=lambda kv: estimate(kv[0])[0])
+        lat, n = estimate(key)
+        skipped.remove(slow_msg[key])
+        del slow[key]
+        tasks.append((src, arg))
+        lats.append(lat)
+        exp_docs += min(n, max_per_source)
+
+    planned = {_key(s, a) for s, a in tasks}
+    with _lock:
+        for key in planned:
+            _skips.pop(key, None)
+    probes = [t for key, t in slow.items() if key not in planned and _skip_due(key)]
+
+    fetch_s = _makespan(lats) if lats else 0.0
+    exp_docs = min(exp_docs, max_per_source * 6)
+    score_budget = max(budget_s - fetch_s, 0.0)
+
+    max_features = FEATURE_TIERS[-1][0]
+    for feats, prior in FEATURE_TIERS:
+        key = f"score:{feats}"
+        if SCORE_FIXED + _score_cost(feats, prior) * max(exp_docs, 1) <= score_budget:
+            max_features = feats
+            with _lock:
+                _skips.pop(key, None)
+            break
+        # A tier can only be re-measured by using it, so after PROBE_AFTER
+        # rejections forget its stats and try it again at the prior.
+        if _skip_due(key):
+            with _lock:
+                _stats.pop(key, None)
+    if max_features < FEATURE_TIERS[0][0]:
+        skipped.append(f"vectorizer capped at {max_features} features")
+
+    return {
+        "budget_s": budget_s,
+        "tasks": tasks,
+        "probes": probes,
+        "deadline_s": fetch_s * 1.25 if forced else fetch_budget,
+        "max_features": max_features,
+        "skipped": skipped,
+    }
+
+def score_capacity(feats: int, seconds: float) -> int:
+    """How many docs the `feats` tier can score in `seconds` (never below MIN_DOCS)."""
+    per_doc = _score_cost(feats, dict(FEATURE_TIERS).get(feats, FEATURE_TIERS[0][1]))
+    return max(MIN_DOCS, int((seconds - SCORE_FIXED) / max(per_doc, 1e-6)))
+
+def observe_score(feats: int, seconds: float, n: int):
+    """Record a scoring run; small runs are dominated by fit overhead, so skip them."""
+    if n < MIN_DOCS: return
+    observe(f"score:{feats}", max(seconds - SCORE_FIXED, 0.0) / n, n)
+
+def timed(key: str, fn, *args):
+    """Run a fetch and feed its latency and yield back into the stats."""
+    t0 = time.perf_counter()
+    try:
+        out = fn(*args) or []
+    except Exception:
+        observe(key, time.perf_counter() - t0, 0)
+        raise
+    observe(key, time.perf_counter() - t0, len(out))
+    return out
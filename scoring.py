@@ -8,15 +8,18 @@ from datetime import datetime, timezone
 def _norm(s: str) -> str:
     return re.sub(r'\s+', ' ', (s or "")).strip()
 
+def _text(job: Dict[str, Any]) -> str:
+    # Prefer the ingest-normalised text; fall back for jobs that skipped it.
+    return job.get("description_clean") or job.get("description") or ""
+
 def build_vectorizer(max_features: int = 40000):
     return TfidfVectorizer(stop_words="english", ngram_range=(1,2), max_features=max_features)
 
 def score_jobs(cv_text: str, jobs: List[Dict[str, Any]], prefs: Dict[str, Any]) -> List[Dict[str, Any]]:
     if not jobs: return []
-    fast = bool(prefs.get("fast_mode", True))
-    max_feats = 20000 if fast else 40000
+    max_feats = int(prefs.get("max_features") or 20000)
 
-    docs = [_norm(cv_text)] + [_norm(j.get("description","")) for j in jobs]
+    docs = [_norm(cv_text)] + [_norm(_text(j)) for j in jobs]
     vec = build_vectorizer(max_features=max_feats)
     X = vec.fit_transform(docs)
     sim = cosine_similarity(X[0:1], X[1:]).flatten()
@@ -55,7 +58,7 @@ def score_jobs(cv_text: str, jobs: List[Dict[str, Any]], prefs: Dict[str, Any])
     kws = [k.strip().lower() for k in prefs.get("must_have_keywords",[]) if k.strip()]
     kwb = []
     for j in jobs:
-        text = (j.get("title","") + " " + j.get("description","")).lower()
+        text = ((j.get("title") or "") + " " + _text(j)).lower()
         if kws and all(k in text for k in kws): kwb.append(1.0)
         elif kws and any(k in text for k in kws): kwb.append(0.8)
         else: kwb.append(0.6)
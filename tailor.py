@@ -56,7 +56,7 @@ CV:
 JOB:
 Title: {job.get('title')}
 Company: {job.get('company')}
-Desc: {(job.get('description','') or '')[:2000]}
+Desc: {(job.get('description_clean') or job.get('description') or '')[:2000]}
 """
     resp = client.chat.completions.create(
         model="gpt-4o-mini",
@@ -0,0 +1,142 @@
+from typing import List, Dict, Any, Set, Tuple
+from collections import Counter, OrderedDict
+from html.parser import HTMLParser
+import hashlib, re, threading
+
+MAX_DESC_CHARS = 4000
+# A paragraph is boilerplate only if the company has at least
+# BOILERPLATE_MIN_POSTINGS distinct postings and it appears in at least
+# BOILERPLATE_SHARE of them (and never in fewer than that many postings).
+BOILERPLATE_MIN_POSTINGS = 3
+BOILERPLATE_SHARE = 0.5
+# Paragraph counts persist across searches, bounded per company and LRU by company.
+MAX_COMPANIES = 500
+MAX_POSTINGS_PER_COMPANY = 200
+
+_BLOCK_TAGS = {"p","div","br","li","ul","ol","tr","table","section","article",
+               "h1","h2","h3","h4","h5","h6","blockquote","pre","hr"}
+_SKIP_TAGS = {"script","style","noscript","template","svg"}
+_ws = re.compile(r'[ \t\r\f\v ]+')
+# Sentence end: punctuation, then whitespace and a capital (or the end of text).
+_sentence_end = re.compile(r'[.!?]["\')\]]?(?=\s+["\'(]?[A-Z]|\s*$)')
+_ABBREV = {"e.g.","i.e.","etc.","vs.","approx.","incl.","inc.","ltd.","co.","no.",
+           "mr.","mrs.","ms.","dr.","st.","jr.","sr.","dept.","est."}
+
+_lock = threading.Lock()
+# company -> (distinct posting ids seen, paragraph hash -> postings containing it)
+_companies: "OrderedDict[str, Tuple[Set[int], Counter]]" = OrderedDict()
+
+def _remember(company: str, hs: List[str]):
+    posting = hash(tuple(hs))
+    with _lock:
+        seen, counts = _companies.setdefault(company, (set(), Counter()))
+        _companies.move_to_end(company)
+        if posting not in seen and len(seen) < MAX_POSTINGS_PER_COMPANY:
+            seen.add(posting)
+            counts.update(set(hs))
+        while len(_companies) > MAX_COMPANIES:
+            _companies.popitem(last=False)
+
+def _boilerplate(company: str, hs: List[str]) -> Set[str]:
+    with _lock:
+        seen, counts = _companies.get(company, (set(), Counter()))
+        total = len(seen)
+        if total < BOILERPLATE_MIN_POSTINGS:
+            return set()
+        need = max(BOILERPLATE_MIN_POSTINGS, BOILERPLATE_SHARE * total)
+        return {h for h in hs if counts[h] >= need}
+
+class _TextExtractor(HTMLParser):
+    """Streaming HTML -> text; block tags become paragraph breaks."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS: self._skip += 1
+        elif tag in _BLOCK_TAGS: self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS: self._skip = max(self._skip - 1, 0)
+        elif tag in _BLOCK_TAGS: self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip: self.parts.append(data)
+
+def strip_html(s: str) -> str:
+    if not s: return ""
+    if "<" not in s and "&" not in s:
+        return s
+    p = _TextExtractor()
+    p.feed(s)
+    p.close()
+    return "".join(p.parts)
+
+def paragraphs(s: str) -> List[str]:
+    out = []
+    for line in s.split("\n"):
+        line = _ws.sub(" ", line).strip()
+        if line: out.append(line)
+    return out
+
+def _para_hash(p: str) -> str:
+    return hashlib.blake2b(re.sub(r'\W+', '', p.lower()).encode("utf-8"), digest_size=8).hexdigest()
+
+def _is_abbrev(p: str, end: int) -> bool:
+    word = p[:end].rsplit(None, 1)[-1].lower()
+    return word in _ABBREV
+
+def cap_text(paras: List[str], limit: int=MAX_DESC_CHARS) -> str:
+    """Keep whole paragraphs up to `limit`, cutting the last one at a sentence end."""
+    out, n = [], 0
+    for p in paras:
+        if n + len(p) <= limit:
+            out.append(p)
+            n += len(p) + 1
+            continue
+        room = limit - n
+        # Search the whole paragraph so the lookahead sees past the cut point.
+        cut = [m.end() for m in _sentence_end.finditer(p)
+               if m.end() <= room and not _is_abbrev(p, m.end())]
+        if cut:
+            out.append(p[:cut[-1]])
+        elif not out:
+            out.append(p[:limit].rsplit(" ", 1)[0])
+        break
+    return "\n".join(out)
+
+def content_hash(job: Dict[str, Any], text: str) -> str:
+    parts = [job.get(k) or "" for k in ("title","company","location")] + [text]
+    key = "\x1f".join(_ws.sub(" ", p).strip().lower() for p in parts)
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+def normalize_jobs(jobs: List[Dict[str, Any]], max_chars: int=MAX_DESC_CHARS) -> List[Dict[str, Any]]:
+    """
+    Ingest-time cleanup, run once per job: strip HTML, drop paragraphs repeated
+    across the company's postings seen so far in this process and cap length into `description_clean` (used
+    for scoring, cards and tailoring). `description` is replaced by the
+    stripped, uncapped text so no raw HTML is kept. `content_hash` covers that
+    stripped text, before boilerplate removal and capping.
+    Mutates and returns `jobs`.
+    """
+    split = [paragraphs(strip_html(j.get("description") or "")) for j in jobs]
+    hashes = [[_para_hash(p) for p in paras] for paras in split]
+
+    # Count each paragraph once per distinct posting, per company, across
+    # searches, so the same role seen again (or syndicated through several
+    # sources) is not mistaken for boilerplate.
+    for j, hs in zip(jobs, hashes):
+        company = (j.get("company") or "").lower()
+        if company and hs:
+            _remember(company, hs)
+
+    for j, paras, hs in zip(jobs, split, hashes):
+        drop = _boilerplate((j.get("company") or "").lower(), hs)
+        kept = [p for p, h in zip(paras, hs) if h not in drop]
+        j["description"] = "\n".join(paras)
+        j["description_clean"] = cap_text(kept or paras, max_chars)
+        # Hash the full stripped text, not the history-dependent result above,
+        # so the same posting keys identically across searches.
+        j["content_hash"] = content_hash(j, " ".join(paras))
+    return jobs